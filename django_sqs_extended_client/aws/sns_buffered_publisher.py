@@ -0,0 +1,152 @@
+import atexit
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+from botocore.exceptions import ClientError
+
+from .sns_client_extended import _get_msg_attributes_size, _utf8_len
+
+logger = logging.getLogger(__name__)
+
+
+class BufferedSNSPublisher(object):
+    """
+    Buffers messages in memory and delivers them in the background with SNS publish_batch.
+    Messages are held for at most linger_ms milliseconds, so a single HTTP request carries
+    up to 10 messages for the same topic.
+    :type sns_client: SNSClientExtended
+    :param sns_client: client used to upload large payloads to S3 and to publish the batches
+    :type linger_ms: int
+    :param linger_ms: maximum time in milliseconds a message waits for other messages to batch with
+
+    """
+
+    MAX_BATCH_ENTRIES = 10
+    MAX_BATCH_SIZE = 262144
+
+    def __init__(self, sns_client, linger_ms=50):
+        self.sns_client = sns_client
+        self.linger_ms = linger_ms
+        self._queue = queue.Queue()
+        self._closed = False
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name='BufferedSNSPublisher', daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def publish(self, topic, message, message_attributes: dict, message_deduplication_id=None,
+                message_group_id=None):
+        """
+        Queues a message for delivery and returns a Future resolved with the publish result.
+        Large payloads are uploaded to Amazon S3 before the message is queued.
+        """
+        kwargs = self.sns_client.build_publish_kwargs(topic, message, message_attributes,
+                                                      message_deduplication_id, message_group_id)
+        future = Future()
+        with self._lock:
+            # The worker is also gone in a process forked after the publisher was started.
+            if self._closed or not self._thread.is_alive():
+                raise RuntimeError('BufferedSNSPublisher is not running, the message was not queued.')
+            self._queue.put((kwargs, future))
+        return future
+
+    def close(self):
+        """
+        Delivers the queued messages and stops the background thread.
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            if not self._thread.is_alive():
+                return
+            self._queue.put(None)
+        self._thread.join()
+
+    def _run(self):
+        running = True
+        while running:
+            item = self._queue.get()
+            if item is None:
+                return
+            pending = [item]
+            deadline = time.monotonic() + self.linger_ms / 1000
+            while len(pending) < self.MAX_BATCH_ENTRIES:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if item is None:
+                    running = False
+                    break
+                pending.append(item)
+            try:
+                self._publish_pending(pending)
+            except Exception as e:
+                logger.exception("Failed to publish a batch of SNS messages.")
+                self._fail_futures([future for _, future in pending], e)
+
+    def _publish_pending(self, pending):
+        batches = {}
+        for kwargs, future in pending:
+            topic_batches = batches.setdefault(kwargs['TopicArn'], [[]])
+            batch = topic_batches[-1]
+            entry_size = _utf8_len(kwargs['Message']) + _get_msg_attributes_size(kwargs['MessageAttributes'])
+            batch_size = sum(size for _, _, size in batch)
+            if len(batch) >= self.MAX_BATCH_ENTRIES or (batch and batch_size + entry_size > self.MAX_BATCH_SIZE):
+                batch = []
+                topic_batches.append(batch)
+            batch.append((kwargs, future, entry_size))
+
+        for topic, topic_batches in batches.items():
+            for batch in topic_batches:
+                self._publish_batch(topic, batch)
+
+    def _publish_batch(self, topic, batch):
+        futures = {}
+        try:
+            entries = []
+            for index, (kwargs, future, _) in enumerate(batch):
+                entry_id = str(index)
+                entry = {key: value for key, value in kwargs.items() if key != 'TopicArn'}
+                entry['Id'] = entry_id
+                entries.append(entry)
+                futures[entry_id] = future
+
+            response = self.sns_client.sns.publish_batch(TopicArn=topic, PublishBatchRequestEntries=entries)
+
+            for successful in response.get('Successful', []):
+                future = futures.pop(successful.get('Id'), None)
+                if future is None:
+                    continue
+                result = {'MessageId': successful.get('MessageId')}
+                if successful.get('SequenceNumber'):
+                    result['SequenceNumber'] = successful.get('SequenceNumber')
+                future.set_result(result)
+            for failed in response.get('Failed', []):
+                future = futures.pop(failed.get('Id'), None)
+                if future is None:
+                    continue
+                error = {'Error': {'Code': failed.get('Code'), 'Message': failed.get('Message')}}
+                future.set_exception(ClientError(error, 'PublishBatch'))
+        except Exception as e:
+            logger.exception("Failed to publish a batch of SNS messages.")
+            self._fail_futures([future for _, future, _ in batch], e)
+            return
+
+        if futures:
+            error = {'Error': {'Code': 'MissingResult',
+                               'Message': 'The publish_batch response did not report the message.'}}
+            self._fail_futures(futures.values(), ClientError(error, 'PublishBatch'))
+
+    @staticmethod
+    def _fail_futures(futures, exception):
+        for future in futures:
+            if not future.done():
+                future.set_exception(exception)
@@ -1,13 +1,34 @@
-import base64
+import asyncio
+import functools
 import json
-import os
-import tempfile
+import logging
+import re
+import threading
 import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
 from io import BytesIO
 
-import boto3
+from boto3.exceptions import S3UploadFailedError
+from boto3.s3.transfer import TransferConfig
 from boto3.session import Session
+from botocore.config import Config
+from botocore.exceptions import ClientError
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+if orjson is not None:
+    # Without a default hook orjson then refuses datetimes and dataclasses, like json.dumps does.
+    _ORJSON_DUMPS_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+
+# Any run of 20 digits may hold an integer that does not fit in 64 bits.
+_LONG_NUMBER_RE = re.compile(r'\d{20}')
 
 
 class SQSExtendedClientConstants(Enum):
@@ -18,6 +39,119 @@ class SQSExtendedClientConstants(Enum):
     S3_KEY_MARKER = "-..s3Key..-"
 
 
+_RESERVED = SQSExtendedClientConstants.RESERVED_ATTRIBUTE_NAME.value
+_BUCKET_MARKER = SQSExtendedClientConstants.S3_BUCKET_NAME_MARKER.value
+_KEY_MARKER = SQSExtendedClientConstants.S3_KEY_MARKER.value
+
+_CLIENT_CONFIG = Config(max_pool_connections=50, retries={'max_attempts': 3, 'mode': 'standard'})
+# Payloads above multipart_threshold are uploaded in parallel parts, smaller ones with a plain put_object.
+_TRANSFER_CONFIG = TransferConfig(multipart_threshold=8 * 1024 * 1024, multipart_chunksize=8 * 1024 * 1024,
+                                  max_concurrency=8, use_threads=True)
+_clients = {}
+_clients_lock = threading.Lock()
+_executor = ThreadPoolExecutor(max_workers=10)
+# Separate pool for submit_message/send_message_async, so bursts of sends cannot stall receive_message.
+_send_executor = ThreadPoolExecutor(max_workers=10)
+# Payloads already fetched from S3, by (bucket, key). Keys are unique UUIDs, so entries never go stale;
+# redelivered messages are hydrated without downloading the payload again.
+_S3_TEXT_CACHE_MAXSIZE = 128
+_S3_TEXT_CACHE_MAX_ITEM_SIZE = 512 * 1024
+_s3_text_cache = OrderedDict()
+_s3_text_cache_lock = threading.Lock()
+
+
+def _get_clients(aws_access_key_id=None, aws_secret_access_key=None, aws_region_name=None):
+    """
+    Return the boto3 session and clients shared by every SNSClientExtended
+    built with the same credentials, creating them on first use.
+    """
+    cache_key = (aws_access_key_id, aws_region_name)
+    with _clients_lock:
+        clients = _clients.get(cache_key)
+        if clients is None:
+            if aws_access_key_id and aws_secret_access_key and aws_region_name:
+                session = Session(aws_access_key_id=aws_access_key_id,
+                                  aws_secret_access_key=aws_secret_access_key, region_name=aws_region_name)
+            else:
+                session = Session()
+            clients = {
+                'session': session,
+                'sns': session.client('sns', config=_CLIENT_CONFIG),
+                'sqs': session.client('sqs', config=_CLIENT_CONFIG),
+                's3_client': session.client('s3', config=_CLIENT_CONFIG),
+            }
+            _clients[cache_key] = clients
+        return clients
+
+
+def clear_s3_text_cache():
+    """
+    Empty the cache of payloads fetched from S3.
+    """
+    with _s3_text_cache_lock:
+        _s3_text_cache.clear()
+
+
+def json_dumps(obj):
+    """
+    Serialize obj to a JSON string, with orjson when it is installed.
+    The result is always equivalent to json.dumps(obj), which also decides the accepted values.
+    """
+    if orjson is not None:
+        try:
+            serialized = orjson.dumps(obj, option=_ORJSON_DUMPS_OPTIONS)
+        except TypeError:
+            # orjson refuses some values that json accepts, e.g. non-string keys or integers larger than 64 bits.
+            serialized = None
+        # orjson writes NaN and Infinity as null and accepts UUIDs and enums, which json refuses:
+        # decoding the output back (a C-level comparison) catches both before trusting it.
+        if serialized is not None and orjson.loads(serialized) == obj:
+            return serialized.decode('utf-8')
+    return json.dumps(obj)
+
+
+def json_loads(s):
+    """
+    Deserialize a JSON string, with orjson when it is installed.
+    Returns the same value json.loads would return.
+    """
+    # orjson reads integers wider than 64 bits as floats, only json keeps them exact.
+    if orjson is not None and isinstance(s, str) and _LONG_NUMBER_RE.search(s) is None:
+        try:
+            return orjson.loads(s)
+        except orjson.JSONDecodeError:
+            # e.g. NaN or Infinity written by json.dumps.
+            pass
+    return json.loads(s)
+
+
+def _utf8_len(s):
+    """
+    Return the size in bytes of the UTF-8 encoding of s, without encoding ASCII-only strings.
+    """
+    return len(s) if s.isascii() else len(s.encode('utf-8'))
+
+
+def _get_msg_attributes_size(message_attributes):
+    # sqs binaryValue expects a base64 encoded string as all messages in sqs are strings
+    total_msg_attributes_size = 0
+
+    for key, entry in message_attributes.items():
+        total_msg_attributes_size += _utf8_len(key)
+        if entry.get('DataType'):
+            total_msg_attributes_size += _utf8_len(entry.get('DataType'))
+        if entry.get('StringValue'):
+            total_msg_attributes_size += _utf8_len(entry.get('StringValue'))
+        binary_value = entry.get('BinaryValue')
+        if binary_value:
+            if isinstance(binary_value, (bytes, bytearray)):
+                total_msg_attributes_size += len(binary_value)
+            else:
+                total_msg_attributes_size += _utf8_len(binary_value)
+
+    return total_msg_attributes_size
+
+
 class SNSClientExtended(object):
     """
     A session stores configuration state and allows you to create service
@@ -41,22 +175,11 @@ class SNSClientExtended(object):
         self.s3_bucket_name = s3_bucket_name
         self.message_size_threshold = SQSExtendedClientConstants.DEFAULT_MESSAGE_SIZE_THRESHOLD.value
         self.always_through_s3 = always_through_s3
-        if aws_access_key_id and aws_secret_access_key and aws_region_name:
-            self.sns = boto3.client(
-                'sns',
-                aws_access_key_id=aws_access_key_id,
-                aws_secret_access_key=aws_secret_access_key,
-                region_name=aws_region_name
-            )
-            self.sqs = boto3.client(
-                'sqs',
-                aws_access_key_id=aws_access_key_id,
-                aws_secret_access_key=aws_secret_access_key,
-                region_name=aws_region_name
-            )
-        else:
-            self.sns = boto3.client('sns')
-            self.sqs = boto3.client('sqs')
+        clients = _get_clients(aws_access_key_id, aws_secret_access_key, aws_region_name)
+        self.session = clients['session']
+        self.sns = clients['sns']
+        self.sqs = clients['sqs']
+        self.s3_client = clients['s3_client']
 
     @staticmethod
     def is_large_payload_support_enabled():
@@ -75,46 +198,11 @@ class SNSClientExtended(object):
     """
         self.message_size_threshold = message_size_threshold
 
-    @staticmethod
-    def __get_string_size_in_bytes(message_body):
-        return len(message_body.encode('utf-8'))
-
-    @staticmethod
-    def __stringToBase64(s):
-        return base64.b64encode(s.encode('utf-8'))
-
-    @staticmethod
-    def __base64ToString(b):
-        return base64.b64decode(b).decode('utf-8')
-
-    def __is_base64(self, s):
-        try:
-            encoded = self.__stringToBase64(self.__base64ToString(s))
-            return encoded == str.encode(s)
-        except Exception as e:
+    def __is_large(self, message, msg_attributes_size):
+        # A character takes at most 4 bytes in UTF-8, so short messages need no exact size.
+        if len(message) * 4 + msg_attributes_size <= self.message_size_threshold:
             return False
-
-    def __get_msg_attributes_size(self, message_attributes):
-        # sqs binaryValue expects a base64 encoded string as all messages in sqs are strings
-        total_msg_attributes_size = 0
-
-        for key, entry in message_attributes.items():
-            total_msg_attributes_size += self.__get_string_size_in_bytes(key)
-            if entry.get('DataType'):
-                total_msg_attributes_size += self.__get_string_size_in_bytes(entry.get('DataType'))
-            if entry.get('StringValue'):
-                total_msg_attributes_size += self.__get_string_size_in_bytes(entry.get('StringValue'))
-            if entry.get('BinaryValue'):
-                if self.__is_base64(entry.get('BinaryValue')):
-                    total_msg_attributes_size += len(str.encode(entry.get('BinaryValue')))
-                else:
-                    total_msg_attributes_size += self.__get_string_size_in_bytes(entry.get('BinaryValue'))
-
-        return total_msg_attributes_size
-
-    def __is_large(self, message, message_attributes):
-        msg_attributes_size = self.__get_msg_attributes_size(message_attributes)
-        msg_body_size = self.__get_string_size_in_bytes(message)
+        msg_body_size = _utf8_len(message)
         total_msg_size = msg_attributes_size + msg_body_size
         return total_msg_size > self.message_size_threshold
 
@@ -136,67 +224,70 @@ class SNSClientExtended(object):
         opt_messages = response_opt_queue.get('Messages', [])
         if not opt_messages:
             return None
+        large_messages = []
         for message in opt_messages:
-            message['Body'] = json.loads(message.get('Body'))
-            large_pay_load_attribute_value = message['Body'].get('MessageAttributes', {}).get(
-                SQSExtendedClientConstants.RESERVED_ATTRIBUTE_NAME.value, None)
+            message['Body'] = json_loads(message.get('Body'))
+            large_pay_load_attribute_value = message['Body'].get('MessageAttributes', {}).get(_RESERVED, None)
             if large_pay_load_attribute_value:
-                try:
-                    message_body_inner = json.loads(message['Body'].get('Message'))
-                    if 's3BucketName' not in message_body_inner and 's3Key' not in message_body_inner:
-                        raise ValueError('Detected missing required key attribute s3BucketName and s3Key in s3 payload')
-                    s3_bucket_name = message_body_inner.get('s3BucketName')
-                    s3_key = message_body_inner.get('s3Key')
-                    orig_msg_body = self.get_text_from_s3(s3_bucket_name, s3_key)
-                    message['Body']['Message'] = orig_msg_body
-                    message['Body']['MessageAttributes']['s3_key'] = s3_key
-                    message['Body']['MessageAttributes']['s3_bucket_name'] = s3_bucket_name
-                    # remove the additional attribute before returning the message to user.
-                    message['Body'].get('MessageAttributes').pop(
-                        SQSExtendedClientConstants.RESERVED_ATTRIBUTE_NAME.value)
-                    # Embed s3 object pointer in the receipt handle.
-                    modified_receipt_handle = SQSExtendedClientConstants.S3_BUCKET_NAME_MARKER.value + s3_bucket_name + SQSExtendedClientConstants.S3_BUCKET_NAME_MARKER.value + SQSExtendedClientConstants.S3_KEY_MARKER.value + s3_key + SQSExtendedClientConstants.S3_KEY_MARKER.value + message.get(
-                        'ReceiptHandle')
-                    message['ReceiptHandle'] = modified_receipt_handle
-                except ValueError:
-                    raise ValueError('Decoding JSON has failed')
+                large_messages.append(message)
             else:
-                message['Body'] = json.loads(message.get('Body')) if isinstance(message.get('Body'), str) else message.get('Body')
+                message['Body'] = json_loads(message.get('Body')) if isinstance(message.get('Body'), str) else message.get('Body')
+
+        # Fetch the S3 payloads concurrently, the messages are updated in place.
+        if len(large_messages) == 1:
+            self.__hydrate_large_message(large_messages[0])
+        elif large_messages:
+            list(_executor.map(self.__hydrate_large_message, large_messages))
 
         return opt_messages
 
-    def __delete_message_payload_from_s3(self, receipt_handle, flush_s3):
+    def __hydrate_large_message(self, message):
+        try:
+            message_body_inner = json_loads(message['Body'].get('Message'))
+            if 's3BucketName' not in message_body_inner and 's3Key' not in message_body_inner:
+                raise ValueError('Detected missing required key attribute s3BucketName and s3Key in s3 payload')
+            s3_bucket_name = message_body_inner.get('s3BucketName')
+            s3_key = message_body_inner.get('s3Key')
+            orig_msg_body = self.get_text_from_s3(s3_bucket_name, s3_key)
+            message['Body']['Message'] = orig_msg_body
+            message['Body']['MessageAttributes']['s3_key'] = s3_key
+            message['Body']['MessageAttributes']['s3_bucket_name'] = s3_bucket_name
+            # remove the additional attribute before returning the message to user.
+            message['Body'].get('MessageAttributes').pop(_RESERVED)
+            # Embed s3 object pointer in the receipt handle.
+            modified_receipt_handle = f"{_BUCKET_MARKER}{s3_bucket_name}{_BUCKET_MARKER}" \
+                                      f"{_KEY_MARKER}{s3_key}{_KEY_MARKER}{message.get('ReceiptHandle')}"
+            message['ReceiptHandle'] = modified_receipt_handle
+        except ValueError:
+            raise ValueError('Decoding JSON has failed')
+        return message
+
+    def __delete_message_payload_from_s3(self, s3_msg_bucket_name, s3_msg_key, flush_s3):
         try:
-            s3_msg_bucket_name = self.__get_bucket_marker_from_receipt_handle(receipt_handle,
-                                                                              SQSExtendedClientConstants.S3_BUCKET_NAME_MARKER.value)
-            s3_msg_key = self.__get_bucket_marker_from_receipt_handle(receipt_handle,
-                                                                      SQSExtendedClientConstants.S3_KEY_MARKER.value)
-            session = Session(aws_access_key_id=self.aws_access_key_id,
-                              aws_secret_access_key=self.aws_secret_access_key, region_name=self.aws_region_name)
-            s3 = session.resource('s3')
-            s3_object = s3.Object(s3_msg_bucket_name, s3_msg_key)
             if flush_s3:
-                s3_object.delete()
-                print('Deleted s3 object https://s3.amazonaws.com/{}/{}'.format(s3_msg_bucket_name, s3_msg_key))
+                self.s3_client.delete_object(Bucket=s3_msg_bucket_name, Key=s3_msg_key)
+                with _s3_text_cache_lock:
+                    _s3_text_cache.pop((s3_msg_bucket_name, s3_msg_key), None)
+                logger.debug('Deleted s3 object https://s3.amazonaws.com/%s/%s', s3_msg_bucket_name, s3_msg_key)
         except Exception as e:
-            print("Failed to delete the message content in S3 object. {}, type:{}".format(
-                str(e), type(e).__name__))
+            logger.exception("Failed to delete the message content in S3 object.")
             raise e
 
     @staticmethod
-    def __get_bucket_marker_from_receipt_handle(receipt_handle, marker):
-        start_marker = receipt_handle.index(marker) + len(marker)
-        end_marker = receipt_handle.rindex(marker, start_marker)
-        return receipt_handle[start_marker:end_marker]
-
-    @staticmethod
-    def __get_orig_receipt_handle(receipt_handle):
-        return receipt_handle[receipt_handle.rindex(SQSExtendedClientConstants.S3_KEY_MARKER.value) + len(
-            SQSExtendedClientConstants.S3_KEY_MARKER.value):]
+    def __parse_s3_receipt_handle(receipt_handle):
+        """
+        Split a receipt handle built by receive_message into the s3 bucket name,
+        the s3 key and the original receipt handle.
+        """
+        _, _, rest = receipt_handle.partition(_BUCKET_MARKER)
+        s3_bucket_name, _, rest = rest.partition(_BUCKET_MARKER)
+        _, _, rest = rest.partition(_KEY_MARKER)
+        s3_key, _, orig_receipt_handle = rest.partition(_KEY_MARKER)
+        return s3_bucket_name, s3_key, orig_receipt_handle
 
     @staticmethod
     def __is_s3_receipt_handle(receipt_handle):
-        return True if SQSExtendedClientConstants.S3_BUCKET_NAME_MARKER.value in receipt_handle and SQSExtendedClientConstants.S3_KEY_MARKER.value in receipt_handle else False
+        return _BUCKET_MARKER in receipt_handle and _KEY_MARKER in receipt_handle
 
     def delete_message(self, queue_url, receipt_handle, flush_s3):
         """
@@ -210,9 +301,9 @@ class SNSClientExtended(object):
         Additionally to purging the queue of the message any s3 referenced object will be deleted
         """
         if self.__is_s3_receipt_handle(receipt_handle):
-            self.__delete_message_payload_from_s3(receipt_handle, flush_s3)
-            receipt_handle = self.__get_orig_receipt_handle(receipt_handle)
-        print("receipt_handle={}".format(receipt_handle))
+            s3_msg_bucket_name, s3_msg_key, receipt_handle = self.__parse_s3_receipt_handle(receipt_handle)
+            self.__delete_message_payload_from_s3(s3_msg_bucket_name, s3_msg_key, flush_s3)
+        logger.debug("receipt_handle=%s", receipt_handle)
         try:
             self.sqs.delete_message(QueueUrl=queue_url, ReceiptHandle=receipt_handle)
         except Exception:
@@ -224,28 +315,59 @@ class SNSClientExtended(object):
         Delivers a message to the specified queue and uploads the message payload
         to Amazon S3 if necessary.
         """
+        return self.sns.publish(**self.build_publish_kwargs(topic, message, message_attributes,
+                                                            message_deduplication_id, message_group_id))
+
+    def submit_message(self, topic, message, message_attributes: dict, message_deduplication_id=None,
+                       message_group_id=None):
+        """
+        Runs send_message in a background thread and returns a concurrent.futures.Future
+        resolved with the publish response, so that many messages and their S3 uploads
+        can be in flight at the same time.
+        """
+        return _send_executor.submit(self.send_message, topic, message, message_attributes,
+                                     message_deduplication_id, message_group_id)
+
+    async def send_message_async(self, topic, message, message_attributes: dict, message_deduplication_id=None,
+                                 message_group_id=None):
+        """
+        Awaitable version of send_message. The S3 upload and the SNS publish run in a
+        background thread, so the event loop can keep sending other messages meanwhile.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_send_executor, functools.partial(
+            self.send_message, topic, message, message_attributes, message_deduplication_id, message_group_id))
+
+    def build_publish_kwargs(self, topic, message, message_attributes: dict, message_deduplication_id,
+                             message_group_id):
+        """
+        Validates the message, uploads its payload to Amazon S3 if necessary and returns
+        the arguments for the SNS publish call.
+        """
         if message is None:
             raise ValueError('message_body required')
 
         if isinstance(message, (dict, list)):
-            message = json.dumps(message)
+            message = json_dumps(message)
+        elif not isinstance(message, str):
+            message = str(message)
 
-        msg_attributes_size = self.__get_msg_attributes_size(message_attributes)
+        msg_attributes_size = _get_msg_attributes_size(message_attributes)
         if msg_attributes_size > self.message_size_threshold:
             raise ValueError(
-                "Total size of Message attributes is {} bytes which is larger than the threshold of {} Bytes. Consider including the payload in the message body instead of message attributes.".format(
-                    msg_attributes_size, self.message_size_threshold))
+                f"Total size of Message attributes is {msg_attributes_size} bytes which is larger than the threshold "
+                f"of {self.message_size_threshold} Bytes. Consider including the payload in the message body instead "
+                f"of message attributes.")
 
         message_attributes_number = len(message_attributes)
         if message_attributes_number > SQSExtendedClientConstants.MAX_ALLOWED_ATTRIBUTES.value:
             raise ValueError(
-                "Number of message attributes [{}}] exceeds the maximum allowed for large-payload messages [{}].".format(
-                    message_attributes_number, SQSExtendedClientConstants.MAX_ALLOWED_ATTRIBUTES.value))
+                f"Number of message attributes [{message_attributes_number}] exceeds the maximum allowed for "
+                f"large-payload messages [{SQSExtendedClientConstants.MAX_ALLOWED_ATTRIBUTES.value}].")
 
-        large_payload_attribute_value = message_attributes.get(SQSExtendedClientConstants.RESERVED_ATTRIBUTE_NAME.value)
+        large_payload_attribute_value = message_attributes.get(_RESERVED)
         if large_payload_attribute_value:
-            raise ValueError("Message attribute name {} is reserved for use by SQS extended client.".format(
-                SQSExtendedClientConstants.RESERVED_ATTRIBUTE_NAME.value))
+            raise ValueError(f"Message attribute name {_RESERVED} is reserved for use by SQS extended client.")
 
         kwargs = {'TopicArn': topic, 'MessageAttributes': message_attributes, 'Message': message}
 
@@ -255,15 +377,16 @@ class SNSClientExtended(object):
         if message_deduplication_id:
             kwargs['MessageDeduplicationId'] = message_deduplication_id
 
-        if self.always_through_s3 or self.__is_large(str(message), message_attributes):
+        if self.always_through_s3 or self.__is_large(message, msg_attributes_size):
             if not self.s3_bucket_name.strip():
                 raise ValueError('S3 bucket name cannot be null')
-            s3_key_message = json.dumps(self.__store_message_in_s3(message))
-            message_attributes[SQSExtendedClientConstants.RESERVED_ATTRIBUTE_NAME.value] = {
-                'StringValue': str(self.__get_string_size_in_bytes(message)), 'DataType': 'Number'}
+            message_body = message.encode('utf-8')
+            s3_key_message = json_dumps(self.__store_message_in_s3(message_body))
+            message_attributes[_RESERVED] = {
+                'StringValue': str(len(message_body)), 'DataType': 'Number'}
             kwargs['Message'] = s3_key_message
 
-        return self.sns.publish(**kwargs)
+        return kwargs
 
     def __store_message_in_s3(self, message_body):
         """
@@ -272,37 +395,41 @@ class SNSClientExtended(object):
         """
         try:
             s3_key = str(uuid.uuid4())
-            session = Session(aws_access_key_id=self.aws_access_key_id,
-                              aws_secret_access_key=self.aws_secret_access_key, region_name=self.aws_region_name)
-            s3 = session.resource('s3')
-            opt_file = tempfile.NamedTemporaryFile(mode='w+', encoding='utf-8', delete=False)
-            opt_file.write(str(message_body))
-            opt_file.flush()
-            reader = open(opt_file.name, mode='r', encoding='utf-8')
-            s3.Bucket(self.s3_bucket_name).put_object(Key=s3_key, Body=reader.read())
-            reader.close()
-            opt_file.close()
-            if os.path.exists(opt_file.name):
-                os.remove(opt_file.name)
+            if isinstance(message_body, (bytes, bytearray)):
+                body = message_body
+            else:
+                body = str(message_body).encode('utf-8')
+            if len(body) < _TRANSFER_CONFIG.multipart_threshold:
+                self.s3_client.put_object(Bucket=self.s3_bucket_name, Key=s3_key, Body=body)
+            else:
+                self.s3_client.upload_fileobj(BytesIO(body), self.s3_bucket_name, s3_key, Config=_TRANSFER_CONFIG)
             return {'s3BucketName': self.s3_bucket_name, 's3Key': s3_key}
-        except Exception as e:
-            print("Failed to store the message content in an S3 object. SQS message was not sent. {}, type:{}".format(
-                str(e), type(e).__name__))
+        except (ClientError, S3UploadFailedError) as e:
+            logger.exception("Failed to store the message content in an S3 object. SQS message was not sent.")
             raise e
 
     def get_text_from_s3(self, s3_bucket_name, s3_key):
         """
         Get string representation of a sqs object and store into original SQS message object
         """
-        session = Session(aws_access_key_id=self.aws_access_key_id, aws_secret_access_key=self.aws_secret_access_key,
-                          region_name=self.aws_region_name)
-        s3 = session.resource('s3')
-        bucket = s3.Bucket(s3_bucket_name)
-        objs = list(bucket.objects.filter(Prefix=s3_key))
-        if objs and objs[0].key == s3_key:
-            data_byte_io = BytesIO()
-            bucket = s3.Bucket(s3_bucket_name)
-            bucket.Object(s3_key).download_fileobj(data_byte_io)
-            data_byte_io.seek(0)
-            return data_byte_io.read().decode('utf-8')
-        return None
+        cache_key = (s3_bucket_name, s3_key)
+        with _s3_text_cache_lock:
+            if cache_key in _s3_text_cache:
+                _s3_text_cache.move_to_end(cache_key)
+                return _s3_text_cache[cache_key]
+
+        try:
+            response = self.s3_client.get_object(Bucket=s3_bucket_name, Key=s3_key)
+        except ClientError as e:
+            if e.response.get('Error', {}).get('Code') == 'NoSuchKey':
+                return None
+            raise e
+        body = response['Body'].read()
+        text = body.decode('utf-8')
+
+        if len(body) <= _S3_TEXT_CACHE_MAX_ITEM_SIZE:
+            with _s3_text_cache_lock:
+                _s3_text_cache[cache_key] = text
+                if len(_s3_text_cache) > _S3_TEXT_CACHE_MAXSIZE:
+                    _s3_text_cache.popitem(last=False)
+        return text
@@ -1,9 +1,21 @@
+import sys
+import threading
 import uuid
 
 from django.conf import settings
+from ..aws.sns_buffered_publisher import BufferedSNSPublisher
 from ..aws.sns_client_extended import SNSClientExtended
 from .event_base import EventBase
 
+_clients_lock = threading.Lock()
+
+
+def _build_message_attributes(event_name):
+    # A new dict is needed for every message, send_message adds its own reserved attribute to it.
+    if isinstance(event_name, str):
+        event_name = sys.intern(event_name)
+    return {'event_type': {'DataType': 'String', 'StringValue': event_name}}
+
 
 class EventBaseAws(EventBase):
 
@@ -12,14 +24,51 @@ class EventBaseAws(EventBase):
     AWS_DEFAULT_REGION = settings.AWS_DEFAULT_REGION
     AWS_S3_QUEUE_STORAGE_NAME = settings.AWS_S3_QUEUE_STORAGE_NAME
     AWS_SNS_TOPIC = None
+    AWS_SNS_BUFFERED = getattr(settings, 'AWS_SNS_BUFFERED', False)
+    AWS_SNS_BUFFER_LINGER_MS = getattr(settings, 'AWS_SNS_BUFFER_LINGER_MS', 50)
+
+    _sns_client = None
+    _sns_publisher = None
+
+    # The client and the publisher are looked up in cls.__dict__ so that a subclass overriding
+    # the settings never reuses the instance memoized on its parent class.
+    @classmethod
+    def _get_client(cls):
+        sns_client = cls.__dict__.get('_sns_client')
+        if sns_client is None:
+            with _clients_lock:
+                sns_client = cls.__dict__.get('_sns_client')
+                if sns_client is None:
+                    sns_client = SNSClientExtended(cls.AWS_ACCESS_KEY_ID,
+                                                   cls.AWS_SECRET_ACCESS_KEY,
+                                                   cls.AWS_DEFAULT_REGION,
+                                                   cls.AWS_S3_QUEUE_STORAGE_NAME)
+                    cls._sns_client = sns_client
+        return sns_client
+
+    @classmethod
+    def _get_publisher(cls):
+        sns_publisher = cls.__dict__.get('_sns_publisher')
+        if sns_publisher is None:
+            sns_client = cls._get_client()
+            with _clients_lock:
+                sns_publisher = cls.__dict__.get('_sns_publisher')
+                if sns_publisher is None:
+                    sns_publisher = BufferedSNSPublisher(sns_client, linger_ms=cls.AWS_SNS_BUFFER_LINGER_MS)
+                    cls._sns_publisher = sns_publisher
+        return sns_publisher
 
     def dispatch(self, event_name, event_data, message_group_id: str = None, message_deduplication_id: str = None):
-        message_attributes = {'event_type': {'DataType': 'String', 'StringValue': event_name}}
-        sns = SNSClientExtended(self.AWS_ACCESS_KEY_ID,
-                                self.AWS_SECRET_ACCESS_KEY,
-                                self.AWS_DEFAULT_REGION,
-                                self.AWS_S3_QUEUE_STORAGE_NAME)
-        return sns.send_message(
+        message_attributes = _build_message_attributes(event_name)
+        if self.AWS_SNS_BUFFERED:
+            return self._get_publisher().publish(
+                topic=self.AWS_SNS_TOPIC,
+                message=event_data,
+                message_attributes=message_attributes,
+                message_group_id=message_group_id,
+                message_deduplication_id=message_deduplication_id
+            )
+        return self._get_client().send_message(
             topic=self.AWS_SNS_TOPIC,
             message=event_data,
             message_attributes=message_attributes,
@@ -2,7 +2,7 @@ from time import sleep
 from datetime import datetime
 from django.conf import settings
 from django.core.management.base import BaseCommand
-from django_sqs_extended_client.aws.sns_client_extended import SNSClientExtended
+from django_sqs_extended_client.aws.sns_client_extended import SNSClientExtended, json_loads
 from django_sqs_extended_client.queue.common import SignalHandler
 import pydoc
 import json
@@ -98,7 +98,7 @@ class Command(BaseCommand):
     @staticmethod
     def process_event(queue_code, content_data, attributes):
         try:
-            data = json.loads(content_data)
+            data = json_loads(content_data)
         except (json.JSONDecodeError, TypeError):
             data = content_data
 